@@ -0,0 +1,20 @@
+"""编译Cython加速核心 epos_core
+
+用法: python setup.py build_ext --inplace
+需要系统路径下有 libEposCmd.so (同 epos_driver.py 的要求)。
+"""
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+extensions = [
+    Extension(
+        "epos_core",
+        sources=["src/epos_core.pyx"],
+        libraries=["EposCmd"],
+    ),
+]
+
+setup(
+    name="maxon-driver",
+    ext_modules=cythonize(extensions, language_level=3),
+)
@@ -0,0 +1,105 @@
+"""maxon电机驱动的cffi ABI模式后端
+
+epos_core.pyx 的加速效果最好但需要C编译器; cffi的ABI模式和ctypes一样
+直接dlopen共享库、无需编译, 但函数签名在 cdef() 时一次性解析并缓存,
+输出缓冲区也只在 __init__ 中分配一次, 避免了ctypes每次调用构造
+c_uint()/byref() 对象的分配开销(这部分在高频轮询中占了调用成本的大头)。
+
+用法:
+    from epos_cffi import EposCFFI
+    core = EposCFFI(node_id=1)
+    core.open_device(b"EPOS4", b"MAXON SERIAL V2", b"USB", b"USB0")
+"""
+import cffi
+
+_ffi = cffi.FFI()
+# 只声明热路径用到的函数, 与 epos_core.pyx 保持一致
+_ffi.cdef("""
+    void* VCS_OpenDevice(char* DeviceName, char* ProtocolStackName,
+                         char* InterfaceName, char* PortName,
+                         unsigned int* pErrorCode);
+    int VCS_CloseDevice(void* KeyHandle, unsigned int* pErrorCode);
+    int VCS_ClearFault(void* KeyHandle, unsigned short NodeId,
+                       unsigned int* pErrorCode);
+    int VCS_SetPositionProfile(void* KeyHandle, unsigned short NodeId,
+                               unsigned int ProfileVelocity,
+                               unsigned int ProfileAcceleration,
+                               unsigned int ProfileDeceleration,
+                               unsigned int* pErrorCode);
+    int VCS_MoveToPosition(void* KeyHandle, unsigned short NodeId,
+                           int TargetPosition, int Absolute,
+                           int Immediately, unsigned int* pErrorCode);
+    int VCS_WaitForTargetReached(void* KeyHandle, unsigned short NodeId,
+                                 unsigned int Timeout, unsigned int* pErrorCode);
+    int VCS_GetPositionIs(void* KeyHandle, unsigned short NodeId,
+                          int* pPositionIs, unsigned int* pErrorCode);
+""")
+
+
+class EposCFFI:
+    """热路径控制核心(cffi ABI模式)
+
+    签名只解析一次, 输出缓冲区预分配并反复使用, 热方法内不再有
+    任何对象分配。接口与 epos_core.EposCore 保持一致。
+    """
+
+    def __init__(self, node_id: int = 1, lib_name: str = "libEposCmd.so"):
+        self.lib = _ffi.dlopen(lib_name)
+        self.node_id = node_id
+        self.key_handle = _ffi.NULL
+        # 预分配可复用的输出缓冲区
+        self._p_pos = _ffi.new("int*")
+        self._p_err = _ffi.new("unsigned int*")
+
+    def open_device(self, device_name: bytes, protocol_name: bytes,
+                    interface_name: bytes, port_name: bytes):
+        """打开设备并保存句柄, 失败时抛出RuntimeError"""
+        self.key_handle = self.lib.VCS_OpenDevice(
+            device_name, protocol_name, interface_name, port_name, self._p_err)
+        if self.key_handle == _ffi.NULL:
+            raise RuntimeError(f"VCS_OpenDevice failed! Error Code: {self._p_err[0]:#010x}")
+        return True
+
+    def close_device(self):
+        ret = self.lib.VCS_CloseDevice(self.key_handle, self._p_err)
+        self.key_handle = _ffi.NULL
+        if ret == 0:
+            raise RuntimeError(f"VCS_CloseDevice failed! Error Code: {self._p_err[0]:#010x}")
+        return True
+
+    def clear_fault(self):
+        ret = self.lib.VCS_ClearFault(self.key_handle, self.node_id, self._p_err)
+        if ret == 0:
+            raise RuntimeError(f"VCS_ClearFault failed! Error Code: {self._p_err[0]:#010x}")
+        return True
+
+    def set_position_profile(self, velocity: int, acceleration: int, deceleration: int):
+        ret = self.lib.VCS_SetPositionProfile(
+            self.key_handle, self.node_id, velocity, acceleration, deceleration, self._p_err)
+        if ret == 0:
+            raise RuntimeError(f"VCS_SetPositionProfile failed! Error Code: {self._p_err[0]:#010x}")
+        return True
+
+    def move_to_position(self, target_position: int, absolute: bool = True,
+                         immediate: bool = True):
+        """下发目标位置(Encoder单位), 不等待电机到位"""
+        ret = self.lib.VCS_MoveToPosition(
+            self.key_handle, self.node_id, target_position,
+            absolute, immediate, self._p_err)
+        if ret == 0:
+            raise RuntimeError(f"VCS_MoveToPosition failed! Error Code: {self._p_err[0]:#010x}")
+        return True
+
+    def wait_for_target_reached(self, timeout_ms: int = 1000):
+        """阻塞等待电机到位(cffi调用期间同样释放GIL)"""
+        ret = self.lib.VCS_WaitForTargetReached(
+            self.key_handle, self.node_id, timeout_ms, self._p_err)
+        return ret != 0
+
+    def get_position(self):
+        """读取当前位置(Encoder单位)"""
+        ret = self.lib.VCS_GetPositionIs(
+            self.key_handle, self.node_id, self._p_pos, self._p_err)
+        if ret == 0:
+            raise RuntimeError(f"VCS_GetPositionIs failed! Error Code: {self._p_err[0]:#010x}")
+        return self._p_pos[0]
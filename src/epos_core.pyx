@@ -0,0 +1,161 @@
+# cython: language_level=3
+"""maxon电机驱动的Cython加速核心
+
+ctypes 每次调用都要经过 libffi 的参数打包(约140ns以上), 对于高频轮询位置、
+流式下发目标位置的控制循环来说延迟太大。这里用 Cython 直接声明 libEposCmd
+中的热点 VCS_* 函数, 调用开销降到微秒以下, 并且完全绕开 libffi。
+
+采用混合模式: 只把热路径(打开设备、运动指令、位置读取、等待到位)放在这里,
+设备枚举等低频接口仍然走 `epos_driver.py` 的 ctypes 实现。
+
+编译: python setup.py build_ext --inplace   (需要链接 libEposCmd, 见 setup.py)
+"""
+
+cdef extern from *:
+    """
+    /* libEposCmd 的最小函数原型声明, 与 EPOS Command Library 文档一致,
+       这里只声明热路径用到的函数, 避免依赖厂商头文件 */
+    extern void* VCS_OpenDevice(char* DeviceName, char* ProtocolStackName,
+                                char* InterfaceName, char* PortName,
+                                unsigned int* pErrorCode);
+    extern int VCS_CloseDevice(void* KeyHandle, unsigned int* pErrorCode);
+    extern int VCS_ClearFault(void* KeyHandle, unsigned short NodeId,
+                              unsigned int* pErrorCode);
+    extern int VCS_SetEnableState(void* KeyHandle, unsigned short NodeId,
+                                  unsigned int* pErrorCode);
+    extern int VCS_GetEnableState(void* KeyHandle, unsigned short NodeId,
+                                  int* pIsEnabled, unsigned int* pErrorCode);
+    extern int VCS_GetNbOfDeviceError(void* KeyHandle, unsigned short NodeId,
+                                      unsigned char* pNbDeviceError,
+                                      unsigned int* pErrorCode);
+    extern int VCS_SetPositionProfile(void* KeyHandle, unsigned short NodeId,
+                                      unsigned int ProfileVelocity,
+                                      unsigned int ProfileAcceleration,
+                                      unsigned int ProfileDeceleration,
+                                      unsigned int* pErrorCode);
+    extern int VCS_MoveToPosition(void* KeyHandle, unsigned short NodeId,
+                                  int TargetPosition, int Absolute,
+                                  int Immediately, unsigned int* pErrorCode);
+    extern int VCS_WaitForTargetReached(void* KeyHandle, unsigned short NodeId,
+                                        unsigned int Timeout,
+                                        unsigned int* pErrorCode);
+    extern int VCS_GetPositionIs(void* KeyHandle, unsigned short NodeId,
+                                 int* pPositionIs, unsigned int* pErrorCode);
+    """
+    void* VCS_OpenDevice(char*, char*, char*, char*, unsigned int*) nogil
+    int VCS_CloseDevice(void*, unsigned int*) nogil
+    int VCS_ClearFault(void*, unsigned short, unsigned int*) nogil
+    int VCS_SetEnableState(void*, unsigned short, unsigned int*) nogil
+    int VCS_GetEnableState(void*, unsigned short, int*, unsigned int*) nogil
+    int VCS_GetNbOfDeviceError(void*, unsigned short, unsigned char*, unsigned int*) nogil
+    int VCS_SetPositionProfile(void*, unsigned short, unsigned int, unsigned int, unsigned int, unsigned int*) nogil
+    int VCS_MoveToPosition(void*, unsigned short, int, int, int, unsigned int*) nogil
+    int VCS_WaitForTargetReached(void*, unsigned short, unsigned int, unsigned int*) nogil
+    int VCS_GetPositionIs(void*, unsigned short, int*, unsigned int*) nogil
+
+
+cdef class EposCore:
+    """热路径控制核心: 句柄和节点号都是C属性, 方法内部用栈上局部变量,
+    不经过ctypes的对象分配和参数打包。
+    """
+    cdef void* key_handle
+    cdef unsigned short node_id
+
+    def __cinit__(self, unsigned short node_id=1):
+        self.key_handle = NULL
+        self.node_id = node_id
+
+    def open_device(self, bytes device_name, bytes protocol_name,
+                    bytes interface_name, bytes port_name):
+        """打开设备并保存句柄, 失败时抛出RuntimeError"""
+        cdef unsigned int err = 0
+        self.key_handle = VCS_OpenDevice(
+            device_name, protocol_name, interface_name, port_name, &err)
+        if self.key_handle == NULL:
+            raise RuntimeError(f"VCS_OpenDevice failed! Error Code: {err:#010x}")
+        return True
+
+    def close_device(self):
+        cdef unsigned int err = 0
+        cdef int ret = VCS_CloseDevice(self.key_handle, &err)
+        self.key_handle = NULL
+        if ret == 0:
+            raise RuntimeError(f"VCS_CloseDevice failed! Error Code: {err:#010x}")
+        return True
+
+    def clear_fault(self):
+        cdef unsigned int err = 0
+        cdef int ret = VCS_ClearFault(self.key_handle, self.node_id, &err)
+        if ret == 0:
+            raise RuntimeError(f"VCS_ClearFault failed! Error Code: {err:#010x}")
+        return True
+
+    def enable(self):
+        """故障检查+使能+回读确认, 三个VCS调用在同一个nogil块内完成
+
+        对应 epos_driver.EPOS.enable_state 的状态机序列, 但只有一次
+        Python→C往返; 状态通过栈上局部变量在调用之间传递。
+        Returns:
+            bool: 设备确认进入Enabled状态返回True
+        """
+        cdef unsigned int err = 0
+        cdef unsigned char nb_error = 0
+        cdef int is_enabled = 0
+        cdef int stage = 0
+        with nogil:
+            if VCS_GetNbOfDeviceError(self.key_handle, self.node_id, &nb_error, &err):
+                stage = 1
+                if nb_error == 0:
+                    if VCS_SetEnableState(self.key_handle, self.node_id, &err):
+                        stage = 2
+                        VCS_GetEnableState(self.key_handle, self.node_id, &is_enabled, &err)
+        if stage == 0:
+            raise RuntimeError(f"VCS_GetNbOfDeviceError failed! Error Code: {err:#010x}")
+        if nb_error != 0:
+            raise RuntimeError(f"Device is in Error State! ({nb_error} device errors)")
+        if stage == 1:
+            raise RuntimeError(f"VCS_SetEnableState failed! Error Code: {err:#010x}")
+        return is_enabled != 0
+
+    def set_position_profile(self, unsigned int velocity,
+                             unsigned int acceleration,
+                             unsigned int deceleration):
+        cdef unsigned int err = 0
+        cdef int ret = VCS_SetPositionProfile(
+            self.key_handle, self.node_id, velocity, acceleration, deceleration, &err)
+        if ret == 0:
+            raise RuntimeError(f"VCS_SetPositionProfile failed! Error Code: {err:#010x}")
+        return True
+
+    def move_to_position(self, int target_position, bint absolute=True,
+                         bint immediate=True):
+        """下发目标位置(Encoder单位), 不等待电机到位"""
+        cdef unsigned int err = 0
+        cdef int ret
+        with nogil:
+            ret = VCS_MoveToPosition(
+                self.key_handle, self.node_id, target_position,
+                absolute, immediate, &err)
+        if ret == 0:
+            raise RuntimeError(f"VCS_MoveToPosition failed! Error Code: {err:#010x}")
+        return True
+
+    def wait_for_target_reached(self, unsigned int timeout_ms=1000):
+        """阻塞等待电机到位, 等待期间释放GIL"""
+        cdef unsigned int err = 0
+        cdef int ret
+        with nogil:
+            ret = VCS_WaitForTargetReached(
+                self.key_handle, self.node_id, timeout_ms, &err)
+        return ret != 0
+
+    def get_position(self):
+        """读取当前位置(Encoder单位)"""
+        cdef unsigned int err = 0
+        cdef int position = 0
+        cdef int ret
+        with nogil:
+            ret = VCS_GetPositionIs(self.key_handle, self.node_id, &position, &err)
+        if ret == 0:
+            raise RuntimeError(f"VCS_GetPositionIs failed! Error Code: {err:#010x}")
+        return position
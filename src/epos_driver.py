@@ -14,11 +14,29 @@
 edited by hsy at 2025-04-29
 """
 import ctypes
+import logging
+import math
 import time
 import os
 import numpy as np
 
 
+# 高频轮询方法改用logging: 关掉DEBUG级别后, %式的惰性格式化可以完全跳过
+# 字符串构造和stdout写入, 不像print(f"...")每次都要执行
+logger = logging.getLogger(__name__)
+
+
+# 角度(弧度)到编码器单位的换算系数: 4*1024*35 counts/round ÷ 2π rad/round
+# 量化步长: 1 encoder count ≈ 4.38e-5 rad
+_ENCODER_PER_RAD = (4 * 1024 * 35) / (2 * math.pi)
+_RAD_PER_ENCODER = (2 * math.pi) / (4 * 1024 * 35)      # 反向换算(编码器→弧度)
+
+
+# 枚举结果缓存: 同一台机器上(设备,协议栈,接口)组合对应的候选端口基本不变,
+# 每次实例化都完整走一遍VCS枚举API纯属浪费
+_ENUM_CACHE = {}
+
+
 # 定义操作模式值到描述性名称的映射字典
 # 数据来源于 EPOS 文档中的 Table 5-19
 OPERATION_MODE_MAP = {
@@ -56,8 +74,10 @@ def get_operation_mode_description(mode_value):
   Returns:
       str: 操作模式的描述性名称，如果未找到则返回包含原值的未知提示。
   """
-  # 使用字典的 .get() 方法，如果找不到键，则返回第二个参数作为默认值
-  return OPERATION_MODE_MAP.get(mode_value, f"Unknown Mode (Value: {mode_value})")
+  # 不把默认值传给 .get(): 传了的话即使命中也会先构造一遍f-string,
+  # 而绝大多数调用都是命中的
+  description = OPERATION_MODE_MAP.get(mode_value)
+  return description if description is not None else f"Unknown Mode (Value: {mode_value})"
 
 
 def get_position_sensor_description(sensor_type_value):
@@ -68,126 +88,217 @@ def get_position_sensor_description(sensor_type_value):
   Returns:
       str: 传感器类型的描述字符串。如果传入的值未知，则返回提示信息。
   """
-  # 如果不存在，返回 .get() 方法的第二个参数作为默认值。
-  return SENSOR_TYPE_DESCRIPTION_MAP.get(sensor_type_value, f"Unknown Sensor Type (Value: {sensor_type_value})")
+  # 同上, 默认的f-string只在查不到时才构造
+  description = SENSOR_TYPE_DESCRIPTION_MAP.get(sensor_type_value)
+  return description if description is not None else f"Unknown Sensor Type (Value: {sensor_type_value})"
 
 
 def print_center(string, width=60, fill_char='='):
     """打印居中对齐的字符串
     """
-    # 计算填充字符的数量
-    fill_count = (width - len(string)) // 2
-    # 打印居中对齐的字符串
-    print(f"{fill_char * fill_count} {string} {fill_char * fill_count}")
-    # 如果总宽度是奇数，补一个填充字符
-    if (width - len(string)) % 2 != 0:
-        print(fill_char)
+    # str.center是单次C实现的调用, 省去两次字符串乘法和f-string拼接;
+    # 顺便修掉原先宽度为奇数时多打一行填充字符的问题
+    print(f" {string} ".center(width, fill_char))
+
+
+def _configure_prototypes(epos):
+    """为所有用到的VCS_*函数设置 argtypes/restype (模块加载时只做一次)
+
+    不设置原型时, ctypes每次调用都要重新推断各参数的类型, 且返回值
+    一律按 c_int 处理 (VCS_OpenDevice 返回的 HANDLE 在64位系统上会被
+    截断)。类型别名与 EPOS Command Library 文档一致。
+    """
+    BOOL    = ctypes.c_int
+    HANDLE  = ctypes.c_void_p
+    WORD    = ctypes.c_ushort
+    DWORD   = ctypes.c_uint
+    P_BOOL  = ctypes.POINTER(ctypes.c_int)
+    P_INT   = ctypes.POINTER(ctypes.c_int)
+    P_BYTE  = ctypes.POINTER(ctypes.c_ubyte)
+    P_WORD  = ctypes.POINTER(ctypes.c_ushort)
+    P_DWORD = ctypes.POINTER(ctypes.c_uint)
+    P_INT8  = ctypes.POINTER(ctypes.c_int8)
+    STR     = ctypes.c_char_p
+
+    epos.VCS_OpenDevice.argtypes  = [STR, STR, STR, STR, P_DWORD]
+    epos.VCS_OpenDevice.restype   = HANDLE
+    epos.VCS_CloseDevice.argtypes = [HANDLE, P_DWORD]
+    epos.VCS_CloseDevice.restype  = BOOL
+
+    epos.VCS_ClearFault.argtypes      = [HANDLE, WORD, P_DWORD]
+    epos.VCS_ClearFault.restype       = BOOL
+    epos.VCS_SetEnableState.argtypes  = [HANDLE, WORD, P_DWORD]
+    epos.VCS_SetEnableState.restype   = BOOL
+    epos.VCS_GetEnableState.argtypes  = [HANDLE, WORD, P_BOOL, P_DWORD]
+    epos.VCS_GetEnableState.restype   = BOOL
+    epos.VCS_SetDisableState.argtypes = [HANDLE, WORD, P_DWORD]
+    epos.VCS_SetDisableState.restype  = BOOL
+    epos.VCS_GetDisableState.argtypes = [HANDLE, WORD, P_BOOL, P_DWORD]
+    epos.VCS_GetDisableState.restype  = BOOL
+    epos.VCS_GetNbOfDeviceError.argtypes = [HANDLE, WORD, P_BYTE, P_DWORD]
+    epos.VCS_GetNbOfDeviceError.restype  = BOOL
+
+    epos.VCS_SetOperationMode.argtypes = [HANDLE, WORD, ctypes.c_int8, P_DWORD]
+    epos.VCS_SetOperationMode.restype  = BOOL
+    epos.VCS_GetOperationMode.argtypes = [HANDLE, WORD, P_INT8, P_DWORD]
+    epos.VCS_GetOperationMode.restype  = BOOL
+
+    epos.VCS_SetPositionProfile.argtypes = [HANDLE, WORD, DWORD, DWORD, DWORD, P_DWORD]
+    epos.VCS_SetPositionProfile.restype  = BOOL
+    epos.VCS_GetPositionProfile.argtypes = [HANDLE, WORD, P_DWORD, P_DWORD, P_DWORD, P_DWORD]
+    epos.VCS_GetPositionProfile.restype  = BOOL
+    epos.VCS_MoveToPosition.argtypes = [HANDLE, WORD, ctypes.c_int, BOOL, BOOL, P_DWORD]
+    epos.VCS_MoveToPosition.restype  = BOOL
+    epos.VCS_WaitForTargetReached.argtypes = [HANDLE, WORD, DWORD, P_DWORD]
+    epos.VCS_WaitForTargetReached.restype  = BOOL
+    epos.VCS_GetPositionIs.argtypes = [HANDLE, WORD, P_INT, P_DWORD]
+    epos.VCS_GetPositionIs.restype  = BOOL
+
+    epos.VCS_GetSensorType.argtypes = [HANDLE, WORD, P_WORD, P_DWORD]
+    epos.VCS_GetSensorType.restype  = BOOL
+    epos.VCS_GetIncEncoderParameter.argtypes = [HANDLE, WORD, P_DWORD, P_BOOL, P_DWORD]
+    epos.VCS_GetIncEncoderParameter.restype  = BOOL
+
+    epos.VCS_GetDeviceNameSelection.argtypes = [BOOL, STR, WORD, P_INT, P_DWORD]
+    epos.VCS_GetDeviceNameSelection.restype  = BOOL
+    epos.VCS_GetProtocolStackNameSelection.argtypes = [STR, BOOL, STR, WORD, P_INT, P_DWORD]
+    epos.VCS_GetProtocolStackNameSelection.restype  = BOOL
+    epos.VCS_GetInterfaceNameSelection.argtypes = [STR, STR, BOOL, STR, WORD, P_INT, P_DWORD]
+    epos.VCS_GetInterfaceNameSelection.restype  = BOOL
+    epos.VCS_GetPortNameSelection.argtypes = [STR, STR, STR, BOOL, STR, WORD, P_INT, P_DWORD]
+    epos.VCS_GetPortNameSelection.restype  = BOOL
+    epos.VCS_GetBaudrateSelection.argtypes = [STR, STR, STR, STR, BOOL, P_DWORD, P_INT, P_DWORD]
+    epos.VCS_GetBaudrateSelection.restype  = BOOL
+    epos.VCS_SetProtocolStackSettings.argtypes = [HANDLE, DWORD, DWORD, P_DWORD]
+    epos.VCS_SetProtocolStackSettings.restype  = BOOL
+
+    epos.VCS_GetErrorInfo.argtypes = [DWORD, STR, WORD]
+    epos.VCS_GetErrorInfo.restype  = BOOL
+
+
+# libEposCmd 只在模块导入时加载一次并共享: 每次 ctypes.CDLL(...) 都会
+# 重建一份新的Python包装和原型表, 把上面设置好的原型全部作废
+try:
+    _EPOS_LIB = ctypes.CDLL("libEposCmd.so")
+    _configure_prototypes(_EPOS_LIB)
+except OSError as _e:
+    print(f"Error loading libEposCmd.so from system path: {_e}")
+    _EPOS_LIB = None
 
 
 class EPOS:
-    def __init__(self, device_name:str="EPOS4", protocol_name:str="MAXON SERIAL V2", interface_name:str="USB"):
-        try:
-            self.epos = ctypes.CDLL("libEposCmd.so")
-        except OSError as e:
-            print(f"Error loading libEposCmd.so from system path: {e}")
-
-        self.device_name = ctypes.c_char_p(device_name.encode('utf-8'))
-        self.protocol_name = ctypes.c_char_p(protocol_name.encode('utf-8'))
-        self.interface_name = ctypes.c_char_p(interface_name.encode('utf-8'))
-        candidate_ports = self.candidate_device()
-        # 需要确定电机是哪个端口，一个电机对应一个端口
-        port_name = candidate_ports[0] if candidate_ports else None
-        self.port_name = ctypes.c_char_p(port_name.encode('utf-8'))
-
-        self.candidate_baudrate()
-        # print("===================================================")
+    # 角度(弧度)到编码器单位的换算系数, 见模块顶部 _ENCODER_PER_RAD
+    ENC_PER_RAD = _ENCODER_PER_RAD
+
+    def __init__(self, device_name:str="EPOS4", protocol_name:str="MAXON SERIAL V2", interface_name:str="USB", port_name:str=None):
+        if _EPOS_LIB is None:
+            raise OSError("libEposCmd.so 未能加载, 无法创建EPOS实例")
+        self.epos = _EPOS_LIB       # 所有实例共享模块级的CDLL及其原型表
+
+        # 把热路径函数指针绑定为实例属性, 方法体内省去对 self.epos 的属性查找
+        self._get_position   = self.epos.VCS_GetPositionIs
+        self._move_to_position = self.epos.VCS_MoveToPosition
+        self._wait_for_target  = self.epos.VCS_WaitForTargetReached
+        self._get_nb_of_device_error = self.epos.VCS_GetNbOfDeviceError
+
+        # 名称字符串只在这里编码一次; bytes对象同时保留在实例上,
+        # 确保 c_char_p 指向的内存在实例生命周期内不被回收
+        self._device_name_bytes    = device_name.encode('utf-8')
+        self._protocol_name_bytes  = protocol_name.encode('utf-8')
+        self._interface_name_bytes = interface_name.encode('utf-8')
+        self.device_name    = ctypes.c_char_p(self._device_name_bytes)
+        self.protocol_name  = ctypes.c_char_p(self._protocol_name_bytes)
+        self.interface_name = ctypes.c_char_p(self._interface_name_bytes)
+        if port_name is None:
+            # 没有指定端口才走枚举(生产环境里端口通常是已知的,
+            # 传入port_name可以省掉启动时几十毫秒的VCS枚举往返)
+            candidate_ports = self.candidate_device()
+            # 需要确定电机是哪个端口，一个电机对应一个端口
+            port_name = candidate_ports[0] if candidate_ports else None
+        self._port_name_bytes = port_name.encode('utf-8')
+        self.port_name = ctypes.c_char_p(self._port_name_bytes)
+        # 波特率枚举不再在构造时强制执行, 需要时调用 candidate_baudrate()
 
         self.node_id:int = 1
         self.key_handle:int = 0
 
-    
+        # 预分配热路径方法复用的输出缓冲区
+        # 每次调用构造 c_int()/c_uint() 都要过一遍PyMalloc和ctypes类型机制,
+        # 1kHz以上的状态轮询里这部分开销不可忽略
+        self._c_position = ctypes.c_int()
+        self._c_error    = ctypes.c_uint()
+        self._c_nb_error = ctypes.c_ubyte()
+        self._c_mode     = ctypes.c_int8()
+        # byref()每次调用都要新建一个CArgObject; pointer()对象构造一次
+        # 就能反复传入, 且argtypes已是POINTER(...), 传参时零转换
+        self._p_position = ctypes.pointer(self._c_position)
+        self._p_error    = ctypes.pointer(self._c_error)
+        self._p_nb_error = ctypes.pointer(self._c_nb_error)
+        self._p_mode     = ctypes.pointer(self._c_mode)
+
+
+    def _enumerate_names(self, vcs_fn, *prefix_args):
+        """逐个产出一类VCS枚举接口返回的名称(解码成str)
+
+        四个VCS_Get*NameSelection接口的调用模式完全一样: 第一次传
+        start_of_selection=True, 之后传False继续取, 直到end_of_selection为真。
+        整个迭代过程共用一个100字节的输出缓冲区。
+        Args:
+            vcs_fn: VCS枚举函数(已设置原型)
+            *prefix_args: start_of_selection标志之前的参数(设备名、协议栈名等)
+        """
+        name_buffer      = ctypes.create_string_buffer(100)
+        end_of_selection = ctypes.c_int()
+        p_error_code     = ctypes.c_uint()
+
+        start_of_selection = True
+        while True:
+            vcs_fn(*prefix_args, start_of_selection, name_buffer, 100,
+                   ctypes.byref(end_of_selection), ctypes.byref(p_error_code))
+            yield name_buffer.value.decode('utf-8')
+            if end_of_selection.value:
+                break
+            start_of_selection = False
+
+
     def candidate_device(self):
         """输出所有可用的设备的信息
         也可以在通过 "./HelloEposCmd  -r" 命令行来查看所有的候选设备信息
+        同一组(设备,协议栈,接口)的枚举结果在模块级缓存, 重复实例化不再走枚举API
         """
+        device_name    = self.device_name       # 指定设备名称, 依据epos型号
+        protocol_name  = self.protocol_name     # 指定协议栈名称
+        interface_name = self.interface_name    # 用USB连接
+
+        cache_key = (device_name.value, protocol_name.value, interface_name.value)
+        cached_ports = _ENUM_CACHE.get(cache_key)
+        if cached_ports is not None:
+            return cached_ports
+
         # 获取设备名称列表 -----------------------
-        device_name_list   = []
-        max_str_size       = ctypes.c_ushort(100)
-        device_name_buffer = ctypes.create_string_buffer(max_str_size.value)
-        end_of_selection   = ctypes.c_int(True)
-        p_error_code       = ctypes.c_uint()
-        _ = self.epos.VCS_GetDeviceNameSelection(
-            True, device_name_buffer, max_str_size, ctypes.byref(end_of_selection), ctypes.byref(p_error_code))
-        # print(f"Available devices:{device_name_buffer.value.decode('utf-8')}")
-        device_name_list.append(device_name_buffer.value.decode('utf-8'))
-
-        while end_of_selection.value==False:
-            # 继续调用VCS_GetDeviceNameSelection，直到end_of_selection为True
-            _ = self.epos.VCS_GetDeviceNameSelection(
-                False, device_name_buffer, max_str_size, ctypes.byref(end_of_selection), ctypes.byref(p_error_code))
-            # print(f"Available devices:{device_name_buffer.value.decode('utf-8')}")
-            device_name_list.append(device_name_buffer.value.decode('utf-8'))
+        device_name_list = list(self._enumerate_names(self.epos.VCS_GetDeviceNameSelection))
         print(f"Available devices: {device_name_list}")
 
-        device_name = self.device_name          # 指定设备名称, 依据epos型号
-
         # 获取协议栈名称列表 -----------------------
-        protocol_name_list     = []
-        max_str_size_proto     = ctypes.c_ushort(100)
-        protocol_name_buffer   = ctypes.create_string_buffer(max_str_size_proto.value) # Output buffer
-        end_of_selection_proto = ctypes.c_int()         # Variable for C int* output
-        p_error_code_proto     = ctypes.c_uint()        # Variable for C unsigned int* output
-
-        _ = self.epos.VCS_GetProtocolStackNameSelection(
-            device_name, True, protocol_name_buffer, max_str_size_proto, ctypes.byref(end_of_selection_proto), ctypes.byref(p_error_code_proto))
-        protocol_name_list.append(protocol_name_buffer.value.decode('utf-8'))
-
-        while end_of_selection_proto.value==False:
-            _ = self.epos.VCS_GetProtocolStackNameSelection(
-                device_name, False, protocol_name_buffer, max_str_size_proto, ctypes.byref(end_of_selection_proto), ctypes.byref(p_error_code_proto))
-            protocol_name_list.append(protocol_name_buffer.value.decode('utf-8'))
+        protocol_name_list = list(self._enumerate_names(
+            self.epos.VCS_GetProtocolStackNameSelection, device_name))
         print(f"Available protocol stacks: {protocol_name_list}")
 
-        protocol_name = self.protocol_name      # 指定协议栈名称
-
         # 获取接口名称列表 -----------------------
-        interface_name_list   = []
-        interface_name_buffer = ctypes.create_string_buffer(max_str_size.value)
-        end_of_selection_inf  = ctypes.c_int()
-        p_error_code_inf      = ctypes.c_uint()
-
-        _ = self.epos.VCS_GetInterfaceNameSelection(
-            device_name, protocol_name, True, interface_name_buffer, max_str_size, ctypes.byref(end_of_selection_inf), ctypes.byref(p_error_code_inf))
-        interface_name_list.append(interface_name_buffer.value.decode('utf-8'))
-
-        while end_of_selection_inf.value==False:
-            _ = self.epos.VCS_GetInterfaceNameSelection(
-                device_name, protocol_name, False, interface_name_buffer, max_str_size, ctypes.byref(end_of_selection_inf), ctypes.byref(p_error_code_inf))
-            interface_name_list.append(interface_name_buffer.value.decode('utf-8'))
+        interface_name_list = list(self._enumerate_names(
+            self.epos.VCS_GetInterfaceNameSelection, device_name, protocol_name))
         print(f"Available interfaces: {interface_name_list}")
 
-        interface_name = self.interface_name    # 用USB连接
-        
         # 获取端口名称列表 -----------------------
-        port_name_list   = []
-        port_name_buffer      = ctypes.create_string_buffer(max_str_size.value)
-        end_of_selection_port = ctypes.c_int()
-        p_error_code_port     = ctypes.c_uint()
-
-        _ = self.epos.VCS_GetPortNameSelection(
-            device_name, protocol_name, interface_name, True, port_name_buffer, max_str_size, ctypes.byref(end_of_selection_port), ctypes.byref(p_error_code_port))
-        port_name_list.append(port_name_buffer.value.decode('utf-8'))
-
-        while end_of_selection_port.value==False:
-            _ = self.epos.VCS_GetPortNameSelection(
-                device_name, protocol_name, interface_name, False, port_name_buffer, max_str_size, ctypes.byref(end_of_selection_port), ctypes.byref(p_error_code_port))
-            port_name_list.append(port_name_buffer.value.decode('utf-8'))
+        port_name_list = list(self._enumerate_names(
+            self.epos.VCS_GetPortNameSelection, device_name, protocol_name, interface_name))
         print(f"Available ports: {port_name_list}")
 
-        print(f"Device name: {device_name.value.decode('utf-8')}; " + 
-              f"Protocol name: {protocol_name.value.decode('utf-8')}; " + 
+        print(f"Device name: {device_name.value.decode('utf-8')}; " +
+              f"Protocol name: {protocol_name.value.decode('utf-8')}; " +
               f"Interface name: {interface_name.value.decode('utf-8')}; ")
 
+        _ENUM_CACHE[cache_key] = port_name_list
         return port_name_list
 
 
@@ -200,9 +311,10 @@ class EPOS:
 
     def open_device(self):
         p_error_code = ctypes.c_uint()
+        # restype 是 HANDLE (c_void_p), 打开失败时返回 None
         self.key_handle = self.epos.VCS_OpenDevice(
-            self.device_name, self.protocol_name, self.interface_name, self.port_name, ctypes.byref(p_error_code))
-        
+            self.device_name, self.protocol_name, self.interface_name, self.port_name, ctypes.byref(p_error_code)) or 0
+
         if self.key_handle != 0:
             print("Open Device, and key handle is: %8d" % self.key_handle)
             return True
@@ -240,7 +352,7 @@ class EPOS:
         
     
     def enable_state(self):
-        pls_enabled = ctypes.c_bool()
+        pls_enabled = ctypes.c_int()     # BOOL 输出参数按 c_int 接收
         error_code = ctypes.c_uint()
 
         if self.device_error_check():           # 检查设备是否有错误
@@ -266,7 +378,7 @@ class EPOS:
 
 
     def disable_state(self):
-        pls_disabled = ctypes.c_bool()
+        pls_disabled = ctypes.c_int()    # BOOL 输出参数按 c_int 接收
         p_error_code = ctypes.c_uint()
 
         ret = self.epos.VCS_SetDisableState(
@@ -299,23 +411,24 @@ class EPOS:
             return True
         else:
             print(f"VCS_SetOperationMode failed!")
-            print(f"Error Code: {error_code.value:#010x}; Description: {self.epos.VCS_GetErrorInfo(error_code.value)}")
+            self.print_error_info(error_code)
             return False
         
     
     def get_operation_mode(self):
-        mode_c = ctypes.c_int8()
-        error_code = ctypes.c_uint()
+        mode_c = self._c_mode              # 复用预分配的输出缓冲区
+        error_code = self._c_error
 
         ret = self.epos.VCS_GetOperationMode(
-            self.key_handle, self.node_id, ctypes.byref(mode_c), ctypes.byref(error_code))
-        
+            self.key_handle, self.node_id, self._p_mode, self._p_error)
+
         if ret:
-            print(f"Operation Mode: {get_operation_mode_description(mode_c.value)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Operation Mode: %s", get_operation_mode_description(mode_c.value))
             return mode_c.value
         else:
             print(f"VCS_GetOperationMode failed!")
-            print(f"Error Code: {error_code.value:#010x}; Description: {self.epos.VCS_GetErrorInfo(error_code.value)}")
+            self.print_error_info(error_code)
             return False
         
     
@@ -329,7 +442,7 @@ class EPOS:
             return True
         else:
             print(f"VCS_SetPositionProfile failed!")
-            print(f"Error Code: {error_code.value:#010x}; Description: {self.epos.VCS_GetErrorInfo(error_code.value)}")
+            self.print_error_info(error_code)
             return False
         
     
@@ -345,48 +458,119 @@ class EPOS:
             return [velocity_c.value, acceleration_c.value, deceleration_c.value]
         else:
             print(f"VCS_GetPositionProfile failed!")
-            print(f"Error Code: {error_code.value:#010x}; Description: {self.epos.VCS_GetErrorInfo(error_code.value)}")
+            self.print_error_info(error_code)
             return False
         
 
-    def ppm_move_position_encoder(self, target_position:int, abosolute:bool=True, immediate:bool=True, blocking_time:int=1000):
-        """电机移动到指定位置(Encoder单位)"""
-        error_code = ctypes.c_uint()
-        ret = self.epos.VCS_MoveToPosition(
-            self.key_handle, self.node_id, target_position, abosolute, immediate, ctypes.byref(error_code))
-        
+    def ppm_move_position_encoder(self, target_position:int, abosolute:bool=True, immediate:bool=True, blocking_time:int=1000, wait:bool=True):
+        """电机移动到指定位置(Encoder单位)
+        Args:
+            wait: 为True时阻塞等待电机到位(最长blocking_time毫秒)。
+                self.epos 经 ctypes.CDLL 加载, 外部调用期间GIL自动释放,
+                等待时不会卡住其他Python线程(传感器轮询、UI等);
+                为False时指令发出后立即返回, 由调用方按自己的节奏轮询位置。
+        """
+        error_code = self._c_error
+        ret = self._move_to_position(
+            self.key_handle, self.node_id, target_position, abosolute, immediate, self._p_error)
+
         if ret:
             # 只能判断成功发送了指令, 并不代表电机已经到达目标位置
-            self.epos.VCS_WaitForTargetReached(
-                self.key_handle, self.node_id, blocking_time, ctypes.byref(error_code))
+            if wait:
+                self._wait_for_target(
+                    self.key_handle, self.node_id, blocking_time, self._p_error)
             return True
         else:
-            raise RuntimeError(f"VCS_MoveToPosition failed!\n" + 
-                               f"Error Code: {error_code.value:#010x}; Description: {self.epos.VCS_GetErrorInfo(error_code.value)}")
+            self.print_error_info(error_code)
+            raise RuntimeError(f"VCS_MoveToPosition failed! Error Code: {error_code.value:#010x}")
             return False
         
 
     def ppm_move_position(self, target_angle:float, abosolute:bool=True, immediate:bool=True, block_time:int=1000):
         """电机移动到指定位置(Angle弧度单位)
         """
-        # 1. 角度转换为编码器单位
-        target_position = int(4 * 1024 * 35 * target_angle / 2 / np.pi)
+        # 1. 角度转换为编码器单位 (int()向零截断, 与量化步长相比误差可忽略)
+        target_position = int(target_angle * _ENCODER_PER_RAD)
         ret = self.ppm_move_position_encoder(
             target_position, abosolute=abosolute, immediate=immediate, blocking_time=block_time)
         
     
+    def get_position_encoder_quiet(self):
+        """get_position_encoder的无日志版本, 供真正的高频轮询循环使用
+        Returns:
+            int: 当前位置(Encoder单位), 读取失败时返回None
+        """
+        ret = self._get_position(
+            self.key_handle, self.node_id, self._p_position, self._p_error)
+        return self._c_position.value if ret else None
+
+
+    def get_positions_encoder_batch(self, n:int):
+        """连续采样n次当前位置(Encoder单位)
+
+        循环体内只用缓存的函数指针、预分配缓冲区和局部名, 采到的值直接
+        写进预分配的int32数组, 供录制轨迹/高频采样使用。
+        Returns:
+            np.ndarray: shape (n,) 的int32数组, 某次读取失败时抛出RuntimeError
+        """
+        positions = np.empty(n, dtype=np.int32)
+        get_position = self._get_position
+        key_handle, node_id = self.key_handle, self.node_id
+        c_pos = self._c_position
+        p_pos = self._p_position
+        p_err = self._p_error
+        for i in range(n):
+            if not get_position(key_handle, node_id, p_pos, p_err):
+                self.print_error_info(self._c_error)
+                raise RuntimeError(f"VCS_GetPositionIs failed! Error Code: {self._c_error.value:#010x}")
+            positions[i] = c_pos.value
+        return positions
+
+
+    def get_positions_batch(self, n:int):
+        """连续采样n次位置并换算成角度(弧度)
+
+        编码器单位到弧度的换算对整个数组一次算完, 不做逐点的标量运算。
+        Returns:
+            np.ndarray: shape (n,) 的float64数组(弧度)
+        """
+        return self.get_positions_encoder_batch(n) * _RAD_PER_ENCODER
+
+
+    def ppm_move_trajectory(self, angles, abosolute:bool=True, block_time:int=1000):
+        """按顺序走完一串路径点(Angle弧度单位)
+
+        角度到编码器单位的转换用NumPy对整个数组一次算完, 避免逐点的
+        Python标量运算; 循环体内直接用缓存的函数指针下发指令。
+        Args:
+            angles: 路径点数组(弧度), 可以是list或np.ndarray
+        """
+        encoder_positions = (np.asarray(angles) * self.ENC_PER_RAD).astype(np.int32)
+        error_code = self._c_error
+        p_error = self._p_error
+        for p in encoder_positions:
+            ret = self._move_to_position(
+                self.key_handle, self.node_id, int(p), abosolute, True, p_error)
+            if not ret:
+                self.print_error_info(error_code)
+                raise RuntimeError(f"VCS_MoveToPosition failed! Error Code: {error_code.value:#010x}")
+            self._wait_for_target(
+                self.key_handle, self.node_id, block_time, p_error)
+        return True
+
+
     def get_position_encoder(self):
-        position_c = ctypes.c_int()
-        error_code = ctypes.c_uint()
-        ret = self.epos.VCS_GetPositionIs(
-            self.key_handle, self.node_id, ctypes.byref(position_c), ctypes.byref(error_code))
+        position_c = self._c_position      # 复用预分配的输出缓冲区
+        error_code = self._c_error
+        ret = self._get_position(
+            self.key_handle, self.node_id, self._p_position, self._p_error)
         
         if ret:
-            print(f"Current Position: {position_c.value}")
+            logger.debug("Current Position: %d", position_c.value)
             return position_c.value
         else:
             print(f"VCS_GetPositionIs failed!")
-            print(f"Error Code: {error_code.value:#010x}; Description: {self.epos.VCS_GetErrorInfo(error_code.value)}")
+            self.print_error_info(error_code)
             return False
         
     
@@ -401,13 +585,13 @@ class EPOS:
             return sensor_type.value
         else:
             print(f"VCS_GetSensorType failed!")
-            print(f"Error Code: {error_code.value:#010x}; Description: {self.epos.VCS_GetErrorInfo(error_code.value)}")
+            self.print_error_info(error_code)
             return False
 
 
     def get_incencoder_parameter(self):
         encoder_resolution = ctypes.c_uint()
-        inverted_ploarity = ctypes.c_bool()
+        inverted_ploarity = ctypes.c_int()   # BOOL 输出参数按 c_int 接收
         error_code = ctypes.c_uint()
 
         ret = self.epos.VCS_GetIncEncoderParameter(
@@ -415,26 +599,28 @@ class EPOS:
         
         if ret:
             # resolution表示
-            print(f"Encoder Resolution: {encoder_resolution.value}; Inverted Polarity: {inverted_ploarity.value}")
-            return [encoder_resolution.value, inverted_ploarity.value]
+            print(f"Encoder Resolution: {encoder_resolution.value}; Inverted Polarity: {bool(inverted_ploarity.value)}")
+            return [encoder_resolution.value, bool(inverted_ploarity.value)]
         else:
             print(f"VCS_GetIncEncoderParameter failed!")
-            print(f"Error Code: {error_code.value:#010x}; Description: {self.epos.VCS_GetErrorInfo(error_code.value)}")
+            self.print_error_info(error_code)
             return False
         
     
     def device_error_check(self):
-        nb_device_error = ctypes.c_uint()
-        error_code = ctypes.c_uint()
-    
-        ret = self.epos.VCS_GetNbOfDeviceError(
-            self.key_handle, self.node_id, ctypes.byref(nb_device_error), ctypes.byref(error_code))
+        nb_device_error = self._c_nb_error   # 复用预分配的输出缓冲区
+        error_code = self._c_error
+
+        ret = self._get_nb_of_device_error(
+            self.key_handle, self.node_id, self._p_nb_error, self._p_error)
 
         if nb_device_error.value >= 1:
-            print(f"Device Error: {nb_device_error.value}")
+            logger.error("Device Error: %d", nb_device_error.value)
             return False
         else:
-            self.print_error_info(error_code)
+            # 只有查询本身失败时才需要解码错误码, 成功路径省掉这次调用
+            if ret == 0:
+                self.print_error_info(error_code)
             return True
         
     
@@ -443,17 +629,24 @@ class EPOS:
         Returns:
             List: _description_
         """
+        # 方法顶部绑定为局部名, 循环内省去重复的属性查找
+        get_baudrate   = self.epos.VCS_GetBaudrateSelection
+        device_name    = self.device_name
+        protocol_name  = self.protocol_name
+        interface_name = self.interface_name
+        port_name      = self.port_name
+
         baudrate_list = []
         baudrate_sel = ctypes.c_uint()      # For unsigned int* pBaudrateSel
         end_of_selection = ctypes.c_int()   # For int* pEndOfSelection
         p_error_code = ctypes.c_uint()        # For unsigned int* pErrorCode
-        ret = self.epos.VCS_GetBaudrateSelection(
-            self.device_name, self.protocol_name, self.interface_name, self.port_name, True, ctypes.byref(baudrate_sel), ctypes.byref(end_of_selection), ctypes.byref(p_error_code))
+        ret = get_baudrate(
+            device_name, protocol_name, interface_name, port_name, True, ctypes.byref(baudrate_sel), ctypes.byref(end_of_selection), ctypes.byref(p_error_code))
         baudrate_list.append(baudrate_sel.value)
 
         while end_of_selection.value == False:
-            self.epos.VCS_GetBaudrateSelection(
-                self.device_name, self.protocol_name, self.interface_name, self.port_name, False, ctypes.byref(baudrate_sel), ctypes.byref(end_of_selection), ctypes.byref(p_error_code))
+            get_baudrate(
+                device_name, protocol_name, interface_name, port_name, False, ctypes.byref(baudrate_sel), ctypes.byref(end_of_selection), ctypes.byref(p_error_code))
             baudrate_list.append(baudrate_sel.value)
         print(f"Available boundrates: {baudrate_list}")
 
@@ -481,6 +674,9 @@ class EPOS:
 
 
 if __name__ == "__main__":
+    # 演示脚本里打开DEBUG日志, 保留位置/模式等状态输出
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+
     motor = EPOS(device_name="EPOS4", protocol_name="MAXON SERIAL V2", interface_name="USB")
     try:
         print_center("EPOS4 Initialization")